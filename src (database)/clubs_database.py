@@ -10,23 +10,27 @@ class Club:
     """
     Club class.
     """
-    def __init__(self, name: str, info) -> None:
+    def __init__(self, name: str, info, media: list = None, club_id: int = None) -> None:
         """
         Club instance initialization.
 
         Args:
             name (str): Name
             info (str): Info
+            media (list): Paths to club logo and photos
+            club_id (int): Club ID used in deep links
         """
         self.name = name
         self.info = info
+        self.media = media or []
+        self.club_id = club_id
 
         self.__check_args()
 
     def __check_args(self) -> None:
         if not isinstance(self.name, str) or not isinstance(self.info, tuple) or \
                 len(self.info) != 2 or not isinstance(self.info[0], str) \
-                or not isinstance(self.info[1], str):
+                or not isinstance(self.info[1], str) or not isinstance(self.media, list):
             raise TypeError
 
     def get_info(self) -> str:
@@ -41,16 +45,18 @@ class Category:
     """
     Club category class.
     """
-    def __init__(self, name: str, clubs: list) -> None:
+    def __init__(self, name: str, clubs: list, category_id: int = None) -> None:
         """
         Category instance initialization.
 
         Args:
             name (str): Name
             clubs (list): Club list
+            category_id (int): Category ID used in deep links
         """
         self.name = name
         self.clubs = clubs
+        self.category_id = category_id
 
         self.__check_args()
 
@@ -84,6 +90,13 @@ class Database:
         )
         self.cursor = self.connection.cursor()
 
+    def migrate(self) -> None:
+        """
+        Add columns missing in databases created before them.
+        """
+        self.cursor.execute("ALTER TABLE clubs ADD COLUMN IF NOT EXISTS media TEXT[]")
+        self.connection.commit()
+
     def get_categories(self):
         """
         Get list of categories.
@@ -103,8 +116,8 @@ class Database:
         Returns:
             list: Clubs
         """
-        self.cursor.execute("SELECT name, link, description FROM clubs WHERE category_id = %s",
-                            (category_id,))
+        self.cursor.execute("SELECT id, name, link, description, media FROM clubs "
+                            "WHERE category_id = %s", (category_id,))
         return self.cursor.fetchall()
 
     def load_data(self) -> list:
@@ -118,8 +131,9 @@ class Database:
         categories = []
         for category_id, category_name in categories_data:
             clubs_info = self.get_clubs_by_category(category_id)
-            clubs = [Club(name, (link, description)) for name, link, description in clubs_info]
-            categories.append(Category(category_name, clubs))
+            clubs = [Club(name, (link, description), media, club_id)
+                     for club_id, name, link, description, media in clubs_info]
+            categories.append(Category(category_name, clubs, category_id))
         return categories
 
     def close(self) -> None:
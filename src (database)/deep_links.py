@@ -0,0 +1,67 @@
+"""
+Generating deep links for club catalog
+"""
+import argparse
+import csv
+
+from clubs_database import Database
+
+
+def build_deep_links(categories: list) -> dict:
+    """
+    Build index of deep link payloads
+
+    Links are printed on posters, so ids of removed clubs and
+    categories must never be reused.
+
+    Args:
+        categories (list): club categories
+    Returns:
+        dict: clubs and categories by payload
+    """
+    deep_links = {}
+    for category in categories:
+        targets = [(f'cat-{category.category_id}', category)]
+        targets += [(f'club-{club.club_id}', club) for club in category.clubs]
+        for payload, target in targets:
+            if payload in deep_links:
+                raise ValueError(f'Duplicate deep link payload {payload}')
+            deep_links[payload] = target
+    return deep_links
+
+
+def generate_links(bot_name: str, deep_links: dict) -> list:
+    """
+    Generate deep links for catalog
+
+    Every link is also the QR code payload for club posters.
+
+    Args:
+        bot_name (str): bot username
+        deep_links (dict): clubs and categories by payload
+    Returns:
+        list: payload, name and link rows
+    """
+    return [(payload, target.name, f'https://t.me/{bot_name}?start={payload}')
+            for payload, target in deep_links.items()]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generate deep links for club catalog')
+    parser.add_argument('bot_name', help='bot username without @')
+    parser.add_argument('--db-name', default='tuberous_club')
+    parser.add_argument('--user', default='postgres')
+    parser.add_argument('--password', default='')
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', default='5432')
+    parser.add_argument('--output', default='dataset/deep_links.csv')
+    args = parser.parse_args()
+
+    database = Database(args.db_name, args.user, args.password, args.host, args.port)
+    categories = database.load_data()
+    database.close()
+
+    with open(args.output, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['payload', 'name', 'link'])
+        writer.writerows(generate_links(args.bot_name, build_deep_links(categories)))
@@ -3,7 +3,10 @@ Creating chatbot via Telegram API
 """
 import telebot
 from data_loader import DataLoader
-from telebot.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
+from deep_links import build_deep_links
+from media_cache import MediaCache, is_file_id_rejected
+from telebot.apihelper import ApiTelegramException
+from telebot.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, InputMediaPhoto, Message
 from token_data import Token
 import os
 import psycopg2
@@ -13,22 +16,47 @@ class Club:
     """
     Club class
     """
-    def __init__(self, name: str, info: str) -> None:
+    def __init__(self, name: str, info: str, media: list = None, club_id: int = None) -> None:
         """
         Bot initialization
 
         Args:
             name (str): name
             info (str): info
+            media (list): paths to club logo and photos
+            club_id (int): club id used in deep links
         """
         self.name = name
         self.info = info
+        self.media = media or []
+        self.club_id = club_id
 
     def get_info(self) -> str:
         """
         Get info about club
         """
-        return f"{self.name} \n\n{self.info[1]}\n \n \n " \
+        return self.__format_info(self.info[1])
+
+    def get_caption(self, limit: int = 1024) -> str:
+        """
+        Get info about club shortened to photo caption limit
+
+        Telegram counts the limit in UTF-16 code units. Only description
+        is shortened, so the link stays in the caption.
+
+        Args:
+            limit (int): caption limit
+        """
+        info = self.get_info()
+        excess = len(info.encode('utf-16-le')) // 2 - limit
+        if excess <= 0:
+            return info
+        description = self.info[1].encode('utf-16-le')
+        length = max(len(description) // 2 - excess - 1, 0)
+        return self.__format_info(description[:length * 2].decode('utf-16-le', 'ignore') + '…')
+
+    def __format_info(self, description: str) -> str:
+        return f"{self.name} \n\n{description}\n \n \n " \
                f"Подробнее о клубе можешь узнать здесь: \n{self.info[0]}"
 
 
@@ -36,16 +64,18 @@ class Category:
     """
     Club category class
     """
-    def __init__(self, name: str, clubs: list) -> None:
+    def __init__(self, name: str, clubs: list, category_id: int = None) -> None:
         """
         Bot initialization
 
         Args:
             name (str): name
             clubs (list): club list
+            category_id (int): category id used in deep links
         """
         self.name = name
         self.clubs = clubs
+        self.category_id = category_id
 
     def get_club_buttons(self) -> InlineKeyboardMarkup:
         """
@@ -74,12 +104,16 @@ class Database:
         )
         self.cursor = self.connection.cursor()
 
+    def migrate(self):
+        self.cursor.execute("ALTER TABLE clubs ADD COLUMN IF NOT EXISTS media TEXT[]")
+        self.connection.commit()
+
     def get_categories(self):
         self.cursor.execute("SELECT * FROM category")
         return self.cursor.fetchall()
 
     def get_clubs_by_category(self, category_id):
-        self.cursor.execute("SELECT name, link, description FROM clubs WHERE category_id = %s", (category_id,))
+        self.cursor.execute("SELECT id, name, link, description, media FROM clubs WHERE category_id = %s", (category_id,))
         return self.cursor.fetchall()
 
     def load_data(self):
@@ -87,8 +121,9 @@ class Database:
         categories = []
         for category_id, category_name in categories_data:
             clubs_info = self.get_clubs_by_category(category_id)
-            clubs = [Club(name, (link, description)) for name, link, description in clubs_info]
-            categories.append(Category(category_name, clubs))
+            clubs = [Club(name, (link, description), media, club_id)
+                     for club_id, name, link, description, media in clubs_info]
+            categories.append(Category(category_name, clubs, category_id))
         return categories
 
     def close(self):
@@ -120,7 +155,12 @@ class ClubBot:
         # else:
         #     self.database = Database(db_name='tuberous_club', user='postgres', password='12345678', host='localhost', port='5432')
 
+        self.database.migrate()
         self.categories = self.database.load_data()
+        self.media_cache = MediaCache('dataset/media_cache.json')
+        self.media_cache.prune([path for category in self.categories
+                                for club in category.clubs for path in club.media])
+        self.deep_links = build_deep_links(self.categories)
         self.load_add_questions()
         self.setup_handlers()
 
@@ -151,18 +191,16 @@ class ClubBot:
                                         "Надеюсь, что буду полезным в будущем :)")
             elif call.data.isdigit():
                 category_index = int(call.data)
-                category = self.categories[category_index]
-                club_buttons = category.get_club_buttons()
-                self.bot.send_message(call.message.chat.id,
-                                      f"{category.name} - отличный выбор! \n"
-                                        "Ты можешь узнать подробную информацию о клубах, "
-                                        "нажав на одну из кнопок ниже:",
-                                      reply_markup=club_buttons)
+                self.send_category(call.message.chat.id, self.categories[category_index])
             elif call.data.startswith('club_'):
                 club_name = call.data.replace('club_', '')
-                club_info = next(club.get_info() for category in self.categories
-                                 for club in category.clubs if club.name == club_name)
-                self.bot.send_message(call.message.chat.id, club_info)
+                club = next(club for category in self.categories
+                            for club in category.clubs if club.name == club_name)
+                self.send_club(call.message.chat.id, club)
+            elif call.data.startswith('photos_'):
+                club = self.deep_links.get(call.data.replace('photos_', 'club-', 1))
+                if club is not None:
+                    self.send_club_photos(call.message.chat.id, club)
             elif call.data == 'additional_info':
                 self.bot.send_message(call.message.chat.id,
                                       self.additional_questions,
@@ -188,6 +226,10 @@ class ClubBot:
                     ' собственного клуба и многое другое.\n\n' \
                     'Давай расскажу!\n\n' \
                     'Инструкцию по использованию ты можешь найти по команде /help'
+            payload = message.text.split(maxsplit=1)[1:]
+            if payload and payload[0] in self.deep_links:
+                self.send_deep_link(message.chat.id, self.deep_links[payload[0]])
+                return
             self.bot.reply_to(message, text)
             self.ask_about_add_activities(message)
 
@@ -264,6 +306,134 @@ class ClubBot:
         self.bot.send_message(message.chat.id, additional_message,
                               reply_markup=additional_markup)
 
+    def send_category(self, chat_id: int, category: Category) -> None:
+        """
+        Send club buttons of category
+
+        Args:
+            chat_id (int): chat id
+            category (Category): category to show
+        """
+        self.bot.send_message(chat_id,
+                              f"{category.name} - отличный выбор! \n"
+                              "Ты можешь узнать подробную информацию о клубах, "
+                              "нажав на одну из кнопок ниже:",
+                              reply_markup=category.get_club_buttons())
+
+    def send_deep_link(self, chat_id: int, target) -> None:
+        """
+        Answer deep link with club card or club buttons
+
+        Args:
+            chat_id (int): chat id
+            target (Club | Category): club or category from deep link
+        """
+        if isinstance(target, Club):
+            self.send_club(chat_id, target, logo_only=True)
+        else:
+            self.send_category(chat_id, target)
+
+    def send_club(self, chat_id: int, club: Club, logo_only: bool = False) -> None:
+        """
+        Send club card with logo and photos
+
+        Every asset is uploaded once, later cards reuse cached file_id.
+
+        Args:
+            chat_id (int): chat id
+            club (Club): club to show
+            logo_only (bool): send single message, other photos by button
+        """
+        media = [path for path in club.media if os.path.exists(path)]
+        if not media:
+            self.bot.send_message(chat_id, club.get_info())
+            return
+
+        if logo_only and len(media) > 1:
+            markup = InlineKeyboardMarkup()
+            markup.add(InlineKeyboardButton("Все фотографии",
+                                            callback_data=f'photos_{club.club_id}'))
+            self.send_album(chat_id, media[:1], club.get_caption(), markup)
+            return
+
+        for start in range(0, len(media), 10):
+            self.send_album(chat_id, media[start:start + 10],
+                            club.get_caption() if start == 0 else None)
+
+    def send_club_photos(self, chat_id: int, club: Club) -> None:
+        """
+        Send club photos left out of single message card
+
+        Args:
+            chat_id (int): chat id
+            club (Club): club to show
+        """
+        media = [path for path in club.media if os.path.exists(path)][1:]
+        for start in range(0, len(media), 10):
+            self.send_album(chat_id, media[start:start + 10])
+
+    def send_album(self, chat_id: int, album: list, caption: str = None,
+                   reply_markup: InlineKeyboardMarkup = None) -> None:
+        """
+        Send up to ten photos as one photo or media group
+
+        If Telegram rejects a cached file_id, cached photos of album
+        are dropped and uploaded again. Other errors leave cache intact.
+
+        Args:
+            chat_id (int): chat id
+            album (list): paths to media files
+            caption (str): caption of first photo
+            reply_markup (InlineKeyboardMarkup): buttons of single photo
+        """
+        try:
+            sent = self.upload_album(chat_id, album, caption, reply_markup)
+        except ApiTelegramException as error:
+            cached = [path for path in album if self.media_cache.get_file_id(path) is not None]
+            if not cached or not is_file_id_rejected(error):
+                raise
+            for path in cached:
+                self.media_cache.delete(path)
+            sent = self.upload_album(chat_id, album, caption, reply_markup)
+
+        for path, msg in zip(album, sent):
+            if self.media_cache.get_file_id(path) is None:
+                self.media_cache.set_file_id(path, msg.photo[-1].file_id)
+
+    def upload_album(self, chat_id: int, album: list, caption: str = None,
+                     reply_markup: InlineKeyboardMarkup = None) -> list:
+        """
+        Send photos with cached file_id or file content
+
+        Args:
+            chat_id (int): chat id
+            album (list): paths to media files
+            caption (str): caption of first photo
+            reply_markup (InlineKeyboardMarkup): buttons of single photo
+        Returns:
+            list: sent messages
+        """
+        if len(album) == 1:
+            return [self.bot.send_photo(chat_id, self.get_media(album[0]), caption=caption,
+                                        reply_markup=reply_markup)]
+        return self.bot.send_media_group(chat_id, [
+            InputMediaPhoto(self.get_media(path), caption=caption if index == 0 else None)
+            for index, path in enumerate(album)
+        ])
+
+    def get_media(self, media_path: str):
+        """
+        Get cached file_id or file content for upload
+
+        Args:
+            media_path (str): path to media file
+        """
+        file_id = self.media_cache.get_file_id(media_path)
+        if file_id is not None:
+            return file_id
+        with open(media_path, 'rb') as f:
+            return f.read()
+
     def start_polling(self) -> None:
         """
         Polling
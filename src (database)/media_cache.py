@@ -0,0 +1,141 @@
+"""
+Telegram file_id cache for club media
+"""
+import hashlib
+import json
+import os
+import threading
+
+
+def is_file_id_rejected(error) -> bool:
+    """
+    Check if Telegram rejected cached file_id
+
+    Args:
+        error (ApiTelegramException): error of Telegram API
+    """
+    description = error.description.lower()
+    return error.error_code == 400 and \
+        ('file identifier' in description or 'file_id' in description)
+
+
+class MediaCache:
+    """
+    Persistent cache of uploaded media, keyed by content hash
+    """
+    def __init__(self, cache_path: str) -> None:
+        """
+        Cache initialization
+
+        Args:
+            cache_path (str): path to cache file
+        """
+        self.cache_path = cache_path
+        self.file_ids = {}
+        self.digests = {}
+        self.lock = threading.RLock()
+        self.load()
+
+    def load(self) -> None:
+        """
+        Load cache from disk
+
+        Unreadable cache is treated as empty, assets are uploaded again.
+        """
+        try:
+            with open(self.cache_path, encoding='utf-8') as f:
+                file_ids = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(file_ids, dict):
+            self.file_ids = file_ids
+
+    def save(self) -> None:
+        """
+        Save cache to disk
+
+        Cache is written to a temporary file first, so the file on disk
+        is never left half-written.
+        """
+        with self.lock:
+            tmp_path = f'{self.cache_path}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.file_ids, f, ensure_ascii=False, indent=4)
+            os.replace(tmp_path, self.cache_path)
+
+    def get_digest(self, media_path: str) -> str:
+        """
+        Get content hash of media file
+
+        The hash is recomputed only when file size or modification time
+        changes, so a replaced asset gets a new key and is uploaded again.
+
+        Args:
+            media_path (str): path to media file
+        """
+        stat = os.stat(media_path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        with self.lock:
+            cached = self.digests.get(media_path)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        with open(media_path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        with self.lock:
+            self.digests[media_path] = (signature, digest)
+        return digest
+
+    def get_file_id(self, media_path: str):
+        """
+        Get Telegram file_id of media file
+
+        Args:
+            media_path (str): path to media file
+        Returns:
+            str: file_id or None if file was not uploaded yet
+        """
+        digest = self.get_digest(media_path)
+        with self.lock:
+            return self.file_ids.get(digest)
+
+    def set_file_id(self, media_path: str, file_id: str) -> None:
+        """
+        Remember Telegram file_id of uploaded media file
+
+        Args:
+            media_path (str): path to media file
+            file_id (str): file_id returned by Telegram
+        """
+        digest = self.get_digest(media_path)
+        with self.lock:
+            self.file_ids[digest] = file_id
+            self.save()
+
+    def delete(self, media_path: str) -> None:
+        """
+        Forget Telegram file_id of media file
+
+        Args:
+            media_path (str): path to media file
+        """
+        digest = self.get_digest(media_path)
+        with self.lock:
+            if self.file_ids.pop(digest, None) is not None:
+                self.save()
+
+    def prune(self, media_paths: list) -> None:
+        """
+        Drop entries of assets that were changed or removed
+
+        Args:
+            media_paths (list): paths to all media files of catalog
+        """
+        digests = {self.get_digest(path) for path in media_paths
+                   if os.path.exists(path)}
+        with self.lock:
+            stale = [digest for digest in self.file_ids if digest not in digests]
+            for digest in stale:
+                del self.file_ids[digest]
+            if stale:
+                self.save()
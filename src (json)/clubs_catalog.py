@@ -0,0 +1,101 @@
+"""
+Catalog structure classes
+"""
+import hashlib
+
+
+def make_id(name: str) -> str:
+    """
+    Make deep link id from club or subject name
+
+    Ids do not depend on catalog order, so adding, removing or moving
+    entries keeps printed links valid. Renaming a club or subject changes
+    its id, and a removed name must never be reused for another club.
+
+    Args:
+        name (str): club or subject name
+    """
+    return hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]
+
+
+class Club:
+    """
+    Club class
+    """
+    def __init__(self, name: str, info: str, media: list = None, club_id: str = None) -> None:
+        """
+        Bot initialization
+
+        Args:
+            name (str): name
+            info (str): info
+            media (list): paths to club logo and photos
+            club_id (str): club id used in deep links
+        """
+        self.name = name
+        self.info = info
+        self.media = media or []
+        self.club_id = club_id
+
+    def get_info(self) -> str:
+        """
+        Get info about club
+        """
+        return self.__format_info(self.info[1])
+
+    def get_caption(self, limit: int = 1024) -> str:
+        """
+        Get info about club shortened to photo caption limit
+
+        Telegram counts the limit in UTF-16 code units. Only description
+        is shortened, so the link stays in the caption.
+
+        Args:
+            limit (int): caption limit
+        """
+        info = self.get_info()
+        excess = len(info.encode('utf-16-le')) // 2 - limit
+        if excess <= 0:
+            return info
+        description = self.info[1].encode('utf-16-le')
+        length = max(len(description) // 2 - excess - 1, 0)
+        return self.__format_info(description[:length * 2].decode('utf-16-le', 'ignore') + '…')
+
+    def __format_info(self, description: str) -> str:
+        return f"{self.name} \n\n{description}\n \n \n " \
+               f"Подробнее о клубе можешь узнать здесь: \n{self.info[0]}"
+
+
+class Subject:
+    """
+    Club subject class
+    """
+    def __init__(self, name: str, clubs: list, subject_id: str = None) -> None:
+        """
+        Bot initialization
+
+        Args:
+            name (str): name
+            clubs (list): club list
+            subject_id (str): subject id used in deep links
+        """
+        self.name = name
+        self.clubs = clubs
+        self.subject_id = subject_id
+
+
+def load_subjects(data: dict) -> list:
+    """
+    Load subjects from catalog
+
+    Args:
+        data (dict): catalog of clubs by subject
+    Returns:
+        list: club subjects
+    """
+    subjects = []
+    for subject_name, clubs_info in data.items():
+        clubs = [Club(name, info[:2], info[2] if len(info) > 2 else None, make_id(name))
+                 for name, info in clubs_info.items()]
+        subjects.append(Subject(subject_name, clubs, make_id(subject_name)))
+    return subjects
@@ -0,0 +1,59 @@
+"""
+Generating deep links for club catalog
+"""
+import argparse
+import csv
+
+from clubs_catalog import load_subjects
+from data_loader import DataLoader
+
+
+def build_deep_links(subjects: list) -> dict:
+    """
+    Build index of deep link payloads
+
+    Args:
+        subjects (list): club subjects
+    Returns:
+        dict: clubs and subjects by payload
+    """
+    deep_links = {}
+    for subject in subjects:
+        targets = [(f'cat-{subject.subject_id}', subject)]
+        targets += [(f'club-{club.club_id}', club) for club in subject.clubs]
+        for payload, target in targets:
+            if payload in deep_links:
+                raise ValueError(f'Duplicate deep link payload {payload}')
+            deep_links[payload] = target
+    return deep_links
+
+
+def generate_links(bot_name: str, deep_links: dict) -> list:
+    """
+    Generate deep links for catalog
+
+    Every link is also the QR code payload for club posters.
+
+    Args:
+        bot_name (str): bot username
+        deep_links (dict): clubs and subjects by payload
+    Returns:
+        list: payload, name and link rows
+    """
+    return [(payload, target.name, f'https://t.me/{bot_name}?start={payload}')
+            for payload, target in deep_links.items()]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generate deep links for club catalog')
+    parser.add_argument('bot_name', help='bot username without @')
+    parser.add_argument('--output', default='dataset/deep_links.csv')
+    args = parser.parse_args()
+
+    data, _ = DataLoader('dataset/clear_data.json', 'dataset/questions.json').load_data()
+    subjects = load_subjects(data)
+
+    with open(args.output, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['payload', 'name', 'link'])
+        writer.writerows(generate_links(args.bot_name, build_deep_links(subjects)))
@@ -2,65 +2,14 @@
 Creating chatbot via Telegram API
 """
 import telebot
+from clubs_catalog import Club, Subject, load_subjects
 from data_loader import DataLoader
-from telebot.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
+from deep_links import build_deep_links
+from media_cache import MediaCache, is_file_id_rejected
+from telebot.apihelper import ApiTelegramException
+from telebot.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, InputMediaPhoto, Message
 from token_data import Token
-
-
-class Club:
-    """
-    Club class
-    """
-    def __init__(self, name: str, info: str) -> None:
-        """
-        Bot initialization
-
-        Args:
-            name (str): name
-            info (str): info
-        """
-        self.name = name
-        self.info = info
-
-    def get_info(self) -> str:
-        """
-        Get info about club
-        """
-        return f"{self.name} \n\n{self.info[1]}\n \n \n " \
-               f"Подробнее о клубе можешь узнать здесь: \n{self.info[0]}"
-
-
-class Subject:
-    """
-    Club subject class
-    """
-    def __init__(self, name: str, clubs: list) -> None:
-        """
-        Bot initialization
-
-        Args:
-            name (str): name
-            clubs (list): club list
-        """
-        self.name = name
-        self.clubs = clubs
-
-    def get_club_buttons(self) -> InlineKeyboardMarkup:
-        """
-        Get club buttons
-        """
-        markup = InlineKeyboardMarkup()
-        row = []
-        for club in self.clubs:
-            row.append(InlineKeyboardButton(club.name, callback_data=f'club_{club.name}'))
-
-            if len(row) == 2:
-                markup.add(*row)
-                row = []
-        if row:
-            markup.add(*row)
-
-        return markup
+import os
 
 
 class ClubBot:
@@ -83,6 +32,10 @@ class ClubBot:
                         'НИУ ВШЭ \n https://vk.com/id307399746 \n\nДо новых встреч :) \n' \
                         '\n Если захочешь снова начать со мной общение, нажми на /start'
         self.load_data()
+        self.media_cache = MediaCache('dataset/media_cache.json')
+        self.media_cache.prune([path for subject in self.subjects
+                                for club in subject.clubs for path in club.media])
+        self.deep_links = build_deep_links(self.subjects)
         self.setup_handlers()
         self.additional_question = {}
 
@@ -90,9 +43,7 @@ class ClubBot:
         data_loader = DataLoader('dataset/clear_data.json', 'dataset/questions.json')
         data, self.additional_questions = data_loader.load_data()
 
-        for subject_name, clubs_info in data.items():
-            clubs = [Club(name, info) for name, info in clubs_info.items()]
-            self.subjects.append(Subject(subject_name, clubs))
+        self.subjects = load_subjects(data)
 
     def setup_handlers(self) -> None:
         """
@@ -117,18 +68,16 @@ class ClubBot:
                                         "Надеюсь, что буду полезным в будущем :)")
             elif call.data.isdigit():
                 subject_index = int(call.data)
-                subject = self.subjects[subject_index]
-                club_buttons = subject.get_club_buttons()
-                self.bot.send_message(call.message.chat.id,
-                                      f"{subject.name} - отличный выбор! \n"
-                                        "Ты можешь узнать подробную информацию о клубах, "
-                                        "нажав на одну из кнопок ниже:",
-                                      reply_markup=club_buttons)
+                self.send_subject(call.message.chat.id, self.subjects[subject_index])
             elif call.data.startswith('club_'):
                 club_name = call.data.replace('club_', '')
-                club_info = next(club.get_info() for subject in self.subjects
-                                 for club in subject.clubs if club.name == club_name)
-                self.bot.send_message(call.message.chat.id, club_info)
+                club = next(club for subject in self.subjects
+                            for club in subject.clubs if club.name == club_name)
+                self.send_club(call.message.chat.id, club)
+            elif call.data.startswith('photos_'):
+                club = self.deep_links.get(call.data.replace('photos_', 'club-', 1))
+                if club is not None:
+                    self.send_club_photos(call.message.chat.id, club)
             elif call.data == 'additional_info':
                 self.bot.send_message(call.message.chat.id,
                                       self.additional_questions,
@@ -154,6 +103,10 @@ class ClubBot:
                     ' собственного клуба и многое другое.\n\n' \
                     'Давай расскажу!\n\n' \
                     'Инструкцию по использованию ты можешь найти по команде /help'
+            payload = message.text.split(maxsplit=1)[1:]
+            if payload and payload[0] in self.deep_links:
+                self.send_deep_link(message.chat.id, self.deep_links[payload[0]])
+                return
             self.bot.reply_to(message, text)
             self.ask_about_add_activities(message)
 
@@ -230,6 +183,154 @@ class ClubBot:
         self.bot.send_message(message.chat.id, additional_message,
                               reply_markup=additional_markup)
 
+    def get_club_buttons(self, subject: Subject) -> InlineKeyboardMarkup:
+        """
+        Get club buttons
+
+        Args:
+            subject (Subject): subject to show
+        """
+        markup = InlineKeyboardMarkup()
+        row = []
+        for club in subject.clubs:
+            row.append(InlineKeyboardButton(club.name, callback_data=f'club_{club.name}'))
+
+            if len(row) == 2:
+                markup.add(*row)
+                row = []
+        if row:
+            markup.add(*row)
+
+        return markup
+
+    def send_subject(self, chat_id: int, subject: Subject) -> None:
+        """
+        Send club buttons of subject
+
+        Args:
+            chat_id (int): chat id
+            subject (Subject): subject to show
+        """
+        self.bot.send_message(chat_id,
+                              f"{subject.name} - отличный выбор! \n"
+                              "Ты можешь узнать подробную информацию о клубах, "
+                              "нажав на одну из кнопок ниже:",
+                              reply_markup=self.get_club_buttons(subject))
+
+    def send_deep_link(self, chat_id: int, target) -> None:
+        """
+        Answer deep link with club card or club buttons
+
+        Args:
+            chat_id (int): chat id
+            target (Club | Subject): club or subject from deep link
+        """
+        if isinstance(target, Club):
+            self.send_club(chat_id, target, logo_only=True)
+        else:
+            self.send_subject(chat_id, target)
+
+    def send_club(self, chat_id: int, club: Club, logo_only: bool = False) -> None:
+        """
+        Send club card with logo and photos
+
+        Every asset is uploaded once, later cards reuse cached file_id.
+
+        Args:
+            chat_id (int): chat id
+            club (Club): club to show
+            logo_only (bool): send single message, other photos by button
+        """
+        media = [path for path in club.media if os.path.exists(path)]
+        if not media:
+            self.bot.send_message(chat_id, club.get_info())
+            return
+
+        if logo_only and len(media) > 1:
+            markup = InlineKeyboardMarkup()
+            markup.add(InlineKeyboardButton("Все фотографии",
+                                            callback_data=f'photos_{club.club_id}'))
+            self.send_album(chat_id, media[:1], club.get_caption(), markup)
+            return
+
+        for start in range(0, len(media), 10):
+            self.send_album(chat_id, media[start:start + 10],
+                            club.get_caption() if start == 0 else None)
+
+    def send_club_photos(self, chat_id: int, club: Club) -> None:
+        """
+        Send club photos left out of single message card
+
+        Args:
+            chat_id (int): chat id
+            club (Club): club to show
+        """
+        media = [path for path in club.media if os.path.exists(path)][1:]
+        for start in range(0, len(media), 10):
+            self.send_album(chat_id, media[start:start + 10])
+
+    def send_album(self, chat_id: int, album: list, caption: str = None,
+                   reply_markup: InlineKeyboardMarkup = None) -> None:
+        """
+        Send up to ten photos as one photo or media group
+
+        If Telegram rejects a cached file_id, cached photos of album
+        are dropped and uploaded again. Other errors leave cache intact.
+
+        Args:
+            chat_id (int): chat id
+            album (list): paths to media files
+            caption (str): caption of first photo
+            reply_markup (InlineKeyboardMarkup): buttons of single photo
+        """
+        try:
+            sent = self.upload_album(chat_id, album, caption, reply_markup)
+        except ApiTelegramException as error:
+            cached = [path for path in album if self.media_cache.get_file_id(path) is not None]
+            if not cached or not is_file_id_rejected(error):
+                raise
+            for path in cached:
+                self.media_cache.delete(path)
+            sent = self.upload_album(chat_id, album, caption, reply_markup)
+
+        for path, msg in zip(album, sent):
+            if self.media_cache.get_file_id(path) is None:
+                self.media_cache.set_file_id(path, msg.photo[-1].file_id)
+
+    def upload_album(self, chat_id: int, album: list, caption: str = None,
+                     reply_markup: InlineKeyboardMarkup = None) -> list:
+        """
+        Send photos with cached file_id or file content
+
+        Args:
+            chat_id (int): chat id
+            album (list): paths to media files
+            caption (str): caption of first photo
+            reply_markup (InlineKeyboardMarkup): buttons of single photo
+        Returns:
+            list: sent messages
+        """
+        if len(album) == 1:
+            return [self.bot.send_photo(chat_id, self.get_media(album[0]), caption=caption,
+                                        reply_markup=reply_markup)]
+        return self.bot.send_media_group(chat_id, [
+            InputMediaPhoto(self.get_media(path), caption=caption if index == 0 else None)
+            for index, path in enumerate(album)
+        ])
+
+    def get_media(self, media_path: str):
+        """
+        Get cached file_id or file content for upload
+
+        Args:
+            media_path (str): path to media file
+        """
+        file_id = self.media_cache.get_file_id(media_path)
+        if file_id is not None:
+            return file_id
+        with open(media_path, 'rb') as f:
+            return f.read()
+
     def start_polling(self) -> None:
         """
         Polling
@@ -0,0 +1,29 @@
+"""
+Fixtures for loading modules of bot variants
+"""
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+MODULES = ('main', 'media_cache', 'deep_links', 'data_loader',
+           'clubs_catalog', 'clubs_database', 'token_data')
+
+
+@pytest.fixture
+def load_module(monkeypatch):
+    """
+    Import module of src (database) or src (json) variant
+
+    Both variants use the same module names, so modules of the other
+    variant are dropped from sys.modules first.
+    """
+    def load(variant: str, name: str):
+        for module in MODULES:
+            monkeypatch.delitem(sys.modules, module, raising=False)
+        monkeypatch.syspath_prepend(str(ROOT / f'src ({variant})'))
+        return importlib.import_module(name)
+
+    return load
@@ -0,0 +1,128 @@
+"""
+Tests for deep link entry points
+"""
+import importlib
+import shutil
+import sys
+from types import ModuleType, SimpleNamespace
+
+import pytest
+
+from conftest import ROOT
+
+
+def make_catalog(load_module, variant: str, club_ids: list) -> list:
+    if variant == 'json':
+        catalog = load_module('json', 'clubs_catalog')
+        clubs = [catalog.Club(f'Club {club_id}', ['vk.com/club', 'Info'], None, club_id)
+                 for club_id in club_ids]
+        return [catalog.Subject('Спорт', clubs, 'sport')]
+    catalog = load_module('database', 'clubs_database')
+    clubs = [catalog.Club(f'Club {club_id}', ('vk.com/club', 'Info'), None, club_id)
+             for club_id in club_ids]
+    return [catalog.Category('Спорт', clubs, 'sport')]
+
+
+@pytest.mark.parametrize('variant', ['database', 'json'])
+def test_payloads_resolve_to_targets(load_module, variant):
+    categories = make_catalog(load_module, variant, ['a1', 'b2'])
+    deep_links = load_module(variant, 'deep_links').build_deep_links(categories)
+
+    assert deep_links['cat-sport'] is categories[0]
+    assert deep_links['club-a1'] is categories[0].clubs[0]
+    assert deep_links['club-b2'] is categories[0].clubs[1]
+
+
+@pytest.mark.parametrize('variant', ['database', 'json'])
+def test_duplicate_payload_raises(load_module, variant):
+    categories = make_catalog(load_module, variant, ['a1', 'a1'])
+
+    with pytest.raises(ValueError):
+        load_module(variant, 'deep_links').build_deep_links(categories)
+
+
+def test_json_ids_do_not_depend_on_catalog_order(load_module):
+    catalog = load_module('json', 'clubs_catalog')
+    build_deep_links = load_module('json', 'deep_links').build_deep_links
+    data = {
+        'Спорт': {'Шахматы': ['vk.com/chess', 'Info'], 'Футбол': ['vk.com/football', 'Info']},
+        'СМИ и медиа': {'Радио': ['vk.com/radio', 'Info']},
+    }
+    reordered = {
+        'СМИ и медиа': {'Газета': ['vk.com/paper', 'Info'], 'Радио': ['vk.com/radio', 'Info']},
+        'Спорт': {'Футбол': ['vk.com/football', 'Info'], 'Шахматы': ['vk.com/chess', 'Info']},
+    }
+
+    names = {payload: target.name
+             for payload, target in build_deep_links(catalog.load_subjects(data)).items()}
+    reordered_names = {payload: target.name
+                       for payload, target in build_deep_links(catalog.load_subjects(reordered)).items()}
+
+    assert names.items() <= reordered_names.items()
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    shutil.copytree(ROOT / 'dataset', tmp_path / 'dataset')
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture(params=['database', 'json'])
+def club_bot(request, load_module, monkeypatch, workdir):
+    if request.param == 'json':
+        load_module('json', 'clubs_catalog')
+        token_data = ModuleType('token_data')
+        token_data.Token = object
+        monkeypatch.setitem(sys.modules, 'token_data', token_data)
+        main = importlib.import_module('main')
+    else:
+        main = load_module('database', 'main')
+        categories = [main.Category('Спорт', [
+            main.Club('Шахматы', ('vk.com/chess', 'Info'), None, 7),
+        ], 3)]
+        monkeypatch.setattr(main, 'Database', lambda **kwargs: SimpleNamespace(
+            migrate=lambda: None, load_data=lambda: categories))
+    return main.ClubBot('1:token')
+
+
+@pytest.fixture
+def sent(club_bot, monkeypatch):
+    calls = []
+    for method in ('send_message', 'reply_to', 'send_photo', 'send_media_group'):
+        monkeypatch.setattr(club_bot.bot, method,
+                            lambda *args, method=method, **kwargs: calls.append((method, args)))
+    return calls
+
+
+def start(club_bot, text: str) -> None:
+    send_welcome = next(handler['function'] for handler in club_bot.bot.message_handlers
+                        if handler['filters'].get('commands') == ['start'])
+    send_welcome(SimpleNamespace(text=text, chat=SimpleNamespace(id=1)))
+
+
+def test_club_link_sends_single_card(club_bot, sent):
+    payload, club = next((payload, target) for payload, target in club_bot.deep_links.items()
+                         if payload.startswith('club-'))
+
+    start(club_bot, f'/start {payload}')
+
+    assert sent == [('send_message', (1, club.get_info()))]
+
+
+def test_category_link_sends_single_message(club_bot, sent):
+    payload, category = next((payload, target) for payload, target in club_bot.deep_links.items()
+                             if payload.startswith('cat-'))
+
+    start(club_bot, f'/start {payload}')
+
+    assert len(sent) == 1
+    assert sent[0][1][1].startswith(f'{category.name} - отличный выбор!')
+
+
+@pytest.mark.parametrize('text', ['/start', '/start club-unknown'])
+def test_unknown_payload_sends_welcome(club_bot, sent, text):
+    start(club_bot, text)
+
+    assert [method for method, _ in sent] == ['reply_to', 'send_message']
+    assert sent[0][1][1].startswith('Привет, меня зовут КЛУБень!')
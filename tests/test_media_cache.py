@@ -0,0 +1,137 @@
+"""
+Tests for club media cache and captions
+"""
+from types import SimpleNamespace
+
+import pytest
+
+VARIANTS = ['database', 'json']
+
+
+@pytest.fixture(params=VARIANTS)
+def media_cache(request, load_module):
+    return load_module(request.param, 'media_cache')
+
+
+def utf16_len(text: str) -> int:
+    return len(text.encode('utf-16-le')) // 2
+
+
+def test_file_id_survives_reload(media_cache, tmp_path):
+    photo = tmp_path / 'logo.jpg'
+    photo.write_bytes(b'logo')
+    cache_path = str(tmp_path / 'cache.json')
+
+    media_cache.MediaCache(cache_path).set_file_id(str(photo), 'file-1')
+
+    assert media_cache.MediaCache(cache_path).get_file_id(str(photo)) == 'file-1'
+
+
+def test_changed_file_gets_new_key(media_cache, tmp_path):
+    photo = tmp_path / 'logo.jpg'
+    photo.write_bytes(b'logo')
+    cache = media_cache.MediaCache(str(tmp_path / 'cache.json'))
+    cache.set_file_id(str(photo), 'file-1')
+
+    photo.write_bytes(b'new logo')
+
+    assert cache.get_file_id(str(photo)) is None
+
+
+def test_same_content_shares_file_id(media_cache, tmp_path):
+    first = tmp_path / 'first.jpg'
+    second = tmp_path / 'second.jpg'
+    first.write_bytes(b'logo')
+    second.write_bytes(b'logo')
+    cache = media_cache.MediaCache(str(tmp_path / 'cache.json'))
+    cache.set_file_id(str(first), 'file-1')
+
+    assert cache.get_file_id(str(second)) == 'file-1'
+
+
+def test_prune_drops_removed_assets(media_cache, tmp_path):
+    kept = tmp_path / 'kept.jpg'
+    removed = tmp_path / 'removed.jpg'
+    kept.write_bytes(b'kept')
+    removed.write_bytes(b'removed')
+    cache_path = str(tmp_path / 'cache.json')
+    cache = media_cache.MediaCache(cache_path)
+    cache.set_file_id(str(kept), 'file-1')
+    cache.set_file_id(str(removed), 'file-2')
+
+    cache.prune([str(kept)])
+
+    assert list(media_cache.MediaCache(cache_path).file_ids.values()) == ['file-1']
+
+
+def test_delete_forgets_file_id(media_cache, tmp_path):
+    photo = tmp_path / 'logo.jpg'
+    photo.write_bytes(b'logo')
+    cache_path = str(tmp_path / 'cache.json')
+    cache = media_cache.MediaCache(cache_path)
+    cache.set_file_id(str(photo), 'file-1')
+
+    cache.delete(str(photo))
+
+    assert cache.get_file_id(str(photo)) is None
+    assert media_cache.MediaCache(cache_path).file_ids == {}
+
+
+def test_corrupt_cache_is_empty(media_cache, tmp_path):
+    photo = tmp_path / 'logo.jpg'
+    photo.write_bytes(b'logo')
+    cache_path = tmp_path / 'cache.json'
+    cache_path.write_text('{"ab', encoding='utf-8')
+
+    cache = media_cache.MediaCache(str(cache_path))
+    assert cache.file_ids == {}
+
+    cache.set_file_id(str(photo), 'file-1')
+    assert media_cache.MediaCache(str(cache_path)).get_file_id(str(photo)) == 'file-1'
+    assert not (tmp_path / 'cache.json.tmp').exists()
+
+
+@pytest.mark.parametrize('error_code, description, rejected', [
+    (400, 'Bad Request: wrong file identifier/HTTP URL specified', True),
+    (400, 'Bad Request: wrong remote file identifier specified: Wrong padding', True),
+    (400, 'Bad Request: invalid file_id', True),
+    (400, 'Bad Request: chat not found', False),
+    (403, 'Forbidden: bot was blocked by the user', False),
+    (429, 'Too Many Requests: retry after 5', False),
+])
+def test_is_file_id_rejected(media_cache, error_code, description, rejected):
+    error = SimpleNamespace(error_code=error_code, description=description)
+
+    assert media_cache.is_file_id_rejected(error) is rejected
+
+
+@pytest.fixture(params=[('json', 'clubs_catalog'), ('database', 'main')])
+def make_club(request, load_module):
+    variant, name = request.param
+    club_class = load_module(variant, name).Club
+    return lambda description: club_class('DELICE', ('vk.com/delice_hse', description))
+
+
+def test_short_caption_is_full_info(make_club):
+    club = make_club('Вокальный ансамбль')
+
+    assert club.get_caption() == club.get_info()
+
+
+@pytest.mark.parametrize('description', ['я' * 1500, '😀' * 700, 'a' * 1000 + '😀' * 10])
+def test_long_caption_fits_limit(make_club, description):
+    caption = make_club(description).get_caption()
+
+    assert utf16_len(caption) <= 1024
+    assert caption.startswith('DELICE')
+    assert caption.endswith('vk.com/delice_hse')
+    assert '…' in caption
+
+
+@pytest.mark.parametrize('limit', [200, 201])
+def test_caption_does_not_split_surrogate_pair(make_club, limit):
+    caption = make_club('😀' * 700).get_caption(limit)
+
+    assert utf16_len(caption) <= limit
+    assert caption.endswith('vk.com/delice_hse')
+    assert caption.encode('utf-8')